@@ -1,15 +1,22 @@
 import re
 import os
 import io
-from flask import Flask, request, send_file, jsonify
+import collections
+import threading
+import multiprocessing
+import unicodedata
+import requests
+from urllib.parse import quote, urlsplit
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, Response, request, jsonify
 from datetime import datetime
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, NextPageTemplate, Table, TableStyle
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, NextPageTemplate, Table, TableStyle, \
+    Flowable
 from reportlab.lib.utils import ImageReader
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
@@ -20,6 +27,15 @@ TEMPLATE_PATH = "template.png"
 PHOTO_URL_DEFAULT = "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?ixlib=rb-1.2.1&auto=format&fit=facearea&facepad=2&w=256&h=256&q=80"
 FONT_PATH_REGULAR = "IBMPlexSansDevanagari-Regular.ttf"
 FONT_NAME_REGULAR = "IBMPlexSansDevanagari-Regular"
+MAX_PHOTO_BYTES = 10 * 1024 * 1024
+MAX_CACHED_PHOTO_BYTES = 1024 * 1024
+PHOTO_CACHE_SIZE = 32
+# Hosts a caller's photo_url may be fetched from (comma-separated); other URLs get the default photo
+PHOTO_HOSTS = frozenset(host.strip().lower() for host in
+                        os.environ.get("PHOTO_HOSTS", urlsplit(PHOTO_URL_DEFAULT).hostname).split(",") if host.strip())
+REQUIRED_FIELDS = ('candidate_name', 'candidate_position', 'date', 'interview_id', 'ai_overview')
+_REQUIRED_FIELD_SET = frozenset(REQUIRED_FIELDS)
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", os.cpu_count() or 1))
 
 # --- PAGE DIMENSIONS & BOX ---
 PAGE_WIDTH, PAGE_HEIGHT = A4
@@ -29,6 +45,40 @@ BOX_HEIGHT = 482
 BOX_TOP_MARGIN = 302
 BOX_BOTTOM_Y = PAGE_HEIGHT - BOX_TOP_MARGIN - BOX_HEIGHT
 
+# --- PRECOMPILED PATTERNS ---
+# The text is first cut into blocks at every line that starts a "Question:", or a
+# numbered section once the block's "Comment:" line (after its "Score:" line)
+# has begun, then each block gets one match attempt at its first "Question:".
+_QA_MARKER_RE = re.compile(r"(?im)^[ \t]*(?:(Question:)|(Score:)|(Comment:)|[0-9]+\.)")
+_QUESTION_RE = re.compile(r"(?i)Question:")
+# The question is taken line by line up to the "Score:" line, and no \s* run is
+# allowed to overlap a following \n, so a match attempt never backtracks more
+# than once over the same whitespace.
+_QA_RE = re.compile(
+    r"(?i)Question:([^\n]*(?:\n[^\n]*)*?)\n[ \t]*Score:\s*(\d+)[ \t\r]*\n\s*Comment:\s*((?s:.*))")
+_SPLIT_RE = re.compile(r"(2\.\s*Overall Evaluation:|Overall Evaluation:)", re.IGNORECASE)
+_TAGS_RE = re.compile(r"(Overall Evaluation:|Final Recommendation:|Strengths:|Weaknesses:)")
+_TAG_MARKUP = {
+    "Overall Evaluation:": "<b>Overall Evaluation:</b>",
+    "Final Recommendation:": "<br/><br/><b>Final Recommendation:</b>",
+    "Strengths:": "<b>Strengths:</b>",
+    "Weaknesses:": "<b>Weaknesses:</b>",
+}
+
+# --- SCORE COLORS (indexed by score 0-10: 0-3 low, 4-6 mid, 7-10 high) ---
+_BAR_COLORS = ((colors.HexColor("#e74c3c"),) * 4 + (colors.HexColor("#f1c40f"),) * 3
+               + (colors.HexColor("#2ecc71"),) * 4)
+_SCORE_TEXT_COLORS = (colors.red,) * 4 + (colors.orange,) * 3 + (colors.green,) * 4
+
+# --- PARAGRAPH STYLES ---
+_STYLES = getSampleStyleSheet()
+_NORMAL_STYLE = ParagraphStyle('TabNormal', parent=_STYLES['Normal'], fontSize=9, leading=11)
+_HEADER_STYLE = ParagraphStyle('TabHeader', parent=_STYLES['Normal'], fontSize=10, leading=12, textColor=colors.white,
+                               fontName='Helvetica-Bold')
+_HEADING_STYLE = ParagraphStyle('Head', parent=_STYLES['Heading3'], fontSize=12,
+                                textColor=colors.HexColor("#1F2A3C"), spaceAfter=6)
+_BODY_STYLE = ParagraphStyle('Body', parent=_STYLES['Normal'], fontSize=10, leading=14)
+
 
 # --- HELPER FUNCTIONS ---
 
@@ -44,18 +94,103 @@ def register_custom_fonts():
     return font_available
 
 
+# Resolved once per process instead of on every first-page draw
+_HAS_CUSTOM_FONT = register_custom_fonts()
+if _HAS_CUSTOM_FONT:
+    _MAIN_FONT, _NAME_FONT = FONT_NAME_REGULAR, FONT_NAME_REGULAR
+else:
+    _MAIN_FONT, _NAME_FONT = "Helvetica", "Helvetica-Bold"
+
+
+def load_template_image():
+    """Loads the page template once so its PNG is not re-read for every PDF."""
+    if not os.path.exists(TEMPLATE_PATH):
+        return None
+    try:
+        return ImageReader(TEMPLATE_PATH)
+    except Exception as e:
+        print(f"Warning: Could not load template: {e}")
+        return None
+
+
+_TEMPLATE_IMG = load_template_image()
+
+
+def download_image(url):
+    """Downloads an image from one of PHOTO_HOSTS, refusing redirects and bodies over MAX_PHOTO_BYTES."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or (parts.hostname or "").lower() not in PHOTO_HOSTS:
+        raise ValueError(f"Photo host is not allowed: {parts.hostname}")
+    with requests.get(url, timeout=5, stream=True, allow_redirects=False) as response:
+        response.raise_for_status()
+        if response.is_redirect:
+            raise ValueError("Photo URL redirects")
+        if int(response.headers.get('Content-Length') or 0) > MAX_PHOTO_BYTES:
+            raise ValueError(f"Photo is larger than {MAX_PHOTO_BYTES} bytes")
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > MAX_PHOTO_BYTES:
+                raise ValueError(f"Photo is larger than {MAX_PHOTO_BYTES} bytes")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+_PHOTO_CACHE = collections.OrderedDict()
+_PHOTO_CACHE_LOCK = threading.Lock()
+
+
+def fetch_image_bytes(url):
+    """Returns the image bytes for url; only photos up to MAX_CACHED_PHOTO_BYTES are kept between requests."""
+    with _PHOTO_CACHE_LOCK:
+        data = _PHOTO_CACHE.get(url)
+        if data is not None:
+            _PHOTO_CACHE.move_to_end(url)
+            return data
+    data = download_image(url)
+    if len(data) <= MAX_CACHED_PHOTO_BYTES:
+        with _PHOTO_CACHE_LOCK:
+            _PHOTO_CACHE[url] = data
+            if len(_PHOTO_CACHE) > PHOTO_CACHE_SIZE:
+                _PHOTO_CACHE.popitem(last=False)
+    return data
+
+
+def load_remote_image(url):
+    return ImageReader(io.BytesIO(fetch_image_bytes(url)))
+
+
 def parse_full_report(text):
     """Parses the text into structured Q&A and remaining text."""
-    qa_pattern = r"Question:\s*(.+?)\s*\n\s*Score:\s*(\d+)\s*\n\s*Comment:\s*(.+?)(?=\n\s*Question:|\n\s*[0-9]+\.|\Z)"
-    matches = re.findall(qa_pattern, text, re.DOTALL | re.IGNORECASE)
-
     structured_qa = []
-    for q, s, c in matches:
-        q_clean = q.replace("Your ", "").strip()
-        c_clean = c.strip().replace("\n", " ")
-        structured_qa.append((q_clean, int(s), c_clean))
 
-    split_match = re.search(r"(2\.\s*Overall Evaluation:|Overall Evaluation:)", text, re.IGNORECASE)
+    # Plain overviews without any "Question:" marker skip the block scan entirely
+    if "question:" in text.lower():
+        # Numbered lines inside a question ("1. Describe X") stay part of it
+        cuts = []
+        score_seen = comment_seen = False
+        for m in _QA_MARKER_RE.finditer(text):
+            marker = m.lastindex  # 1 Question, 2 Score, 3 Comment, None numbered line
+            if marker == 2:
+                score_seen = True
+            elif marker == 3:
+                comment_seen = comment_seen or score_seen
+            elif marker == 1 or comment_seen:
+                cuts.append(m.start())
+                score_seen = comment_seen = False
+
+        for start, end in zip([0] + cuts, cuts + [len(text)]):
+            first = _QUESTION_RE.search(text, start, end)
+            match = first and _QA_RE.match(text, first.start(), end)
+            if not match:
+                continue
+            q, s, c = match.groups()
+            q_clean = q.replace("Your ", "").strip()
+            c_clean = c.strip().replace("\n", " ")
+            structured_qa.append((q_clean, int(s), c_clean))
+
+    split_match = _SPLIT_RE.search(text)
 
     if split_match:
         start_index = split_match.start()
@@ -66,63 +201,78 @@ def parse_full_report(text):
     return structured_qa, remaining_text
 
 
-def create_score_chart(parsed_data):
-    if not parsed_data: return None
-
-    data = [item[1] for item in parsed_data]
-    labels = [f"Q{i + 1}" for i in range(len(data))]
-
-    drawing = Drawing(BOX_WIDTH, 120)
-    bc = VerticalBarChart()
-    bc.x = 20
-    bc.y = 20
-    bc.height = 80
-    bc.width = BOX_WIDTH - 40
-    bc.data = [data]
+def format_remaining_text(text):
+    """Converts newlines to <br/> and bolds the section headings."""
+    if "\n" in text:
+        text = text.replace("\n", "<br/>")
+    return _TAGS_RE.sub(lambda m: _TAG_MARKUP[m.group(1)], text)
+
+
+class ScoreBars(Flowable):
+    """Score bar chart drawn straight onto the canvas (fixed 0-10 scale)."""
+
+    def __init__(self, scores):
+        Flowable.__init__(self)
+        self.scores = scores
+        self.width = BOX_WIDTH
+        self.height = 120
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        c = self.canv
+        x0, y0 = 20, 20
+        plot_w, plot_h = BOX_WIDTH - 40, 80
+        step = plot_w / len(self.scores)
+        bar_w = step * 2 / 3
+        bar_offset = (step - bar_w) / 2
+        unit = plot_h / 10
+
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(1)
+        c.setFont("Times-Roman", 10)
+
+        # Value axis with ticks every 2 points
+        c.line(x0, y0, x0, y0 + plot_h)
+        for v in range(0, 11, 2):
+            y = y0 + v * unit
+            c.line(x0 - 5, y, x0, y)
+            c.drawRightString(x0 - 5, y - 3, str(v))
+
+        # Category axis, bars and Q labels
+        c.line(x0, y0, x0 + plot_w, y0)
+        for i, val in enumerate(self.scores):
+            val = max(0, min(10, val))
+            x = x0 + i * step
+            c.line(x, y0, x, y0 - 5)
+            c.setFillColor(_BAR_COLORS[val])
+            c.rect(x + bar_offset, y0, bar_w, val * unit, fill=1, stroke=1)
+            c.setFillColor(colors.black)
+            c.drawCentredString(x + step / 2, y0 - 13, f"Q{i + 1}")
+        c.line(x0 + plot_w, y0, x0 + plot_w, y0 - 5)
 
-    bc.strokeColor = colors.white
-    bc.valueAxis.valueMin = 0
-    bc.valueAxis.valueMax = 10
-    bc.categoryAxis.categoryNames = labels
-    bc.categoryAxis.labels.boxAnchor = 'n'
-    bc.categoryAxis.labels.dy = -5
 
-    for i, val in enumerate(data):
-        if val <= 3:
-            bc.bars[i].fillColor = colors.HexColor("#e74c3c")
-        elif val <= 6:
-            bc.bars[i].fillColor = colors.HexColor("#f1c40f")
-        else:
-            bc.bars[i].fillColor = colors.HexColor("#2ecc71")
+def create_score_chart(parsed_data):
+    if not parsed_data: return None
 
-    drawing.add(bc)
-    return drawing
+    return ScoreBars([item[1] for item in parsed_data])
 
 
 def create_qa_table(parsed_qa):
     if not parsed_qa: return None
 
-    styles = getSampleStyleSheet()
-    normal_style = ParagraphStyle('TabNormal', parent=styles['Normal'], fontSize=9, leading=11)
-    header_style = ParagraphStyle('TabHeader', parent=styles['Normal'], fontSize=10, leading=12, textColor=colors.white,
-                                  fontName='Helvetica-Bold')
-
     data = [[
-        Paragraph("Question", header_style),
-        Paragraph("Analysis / Feedback", header_style),
-        Paragraph("Score", header_style)
+        Paragraph("Question", _HEADER_STYLE),
+        Paragraph("Analysis / Feedback", _HEADER_STYLE),
+        Paragraph("Score", _HEADER_STYLE)
     ]]
 
-    for q, s, c in parsed_qa:
-        score_color = "green" if s > 6 else "orange" if s > 3 else "red"
-        score_para = Paragraph(f"<font color='{score_color}'><b>{s}/10</b></font>", normal_style)
-
-        row = [
-            Paragraph(q, normal_style),
-            Paragraph(c, normal_style),
-            score_para
-        ]
-        data.append(row)
+    score_cmds = []
+    for row_idx, (q, s, c) in enumerate(parsed_qa, start=1):
+        # Score is a plain cell styled via TableStyle, avoiding a Paragraph markup parse per row
+        data.append([Paragraph(q, _NORMAL_STYLE), Paragraph(c, _NORMAL_STYLE), f"{s}/10"])
+        score_cmds.append(('TEXTCOLOR', (2, row_idx), (2, row_idx), _SCORE_TEXT_COLORS[max(0, min(10, s))]))
 
     col_widths = [140, 286, 70]
     t = Table(data, colWidths=col_widths, repeatRows=1)
@@ -131,35 +281,41 @@ def create_qa_table(parsed_qa):
         ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#1F2A3C")),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('ALIGN', (2, 0), (2, -1), 'CENTER'),
         ('VALIGN', (0, 0), (-1, -1), 'TOP'),
         ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
         ('BOX', (0, 0), (-1, -1), 1, colors.HexColor("#1F2A3C")),
         ('PADDING', (0, 0), (-1, -1), 6),
-    ]))
+        ('FONTNAME', (2, 1), (2, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (2, 1), (2, -1), 9),
+    ] + score_cmds))
     return t
 
 
+def attachment_filename_options(filename):
+    """Content-Disposition filename options, with an RFC 2231 variant for non-ASCII names."""
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+        return {"filename": simple, "filename*": f"UTF-8''{quote(filename, safe='!#$&+^`|~')}"}
+    return {"filename": filename}
+
+
 # --- PAGE DRAWING LOGIC ---
 
 def draw_first_page_bg(canvas, doc):
     canvas.saveState()
 
     # 1. Template
-    if os.path.exists(TEMPLATE_PATH):
+    if _TEMPLATE_IMG:
         try:
-            canvas.drawImage(TEMPLATE_PATH, 0, 0, width=PAGE_WIDTH, height=PAGE_HEIGHT)
+            canvas.drawImage(_TEMPLATE_IMG, 0, 0, width=PAGE_WIDTH, height=PAGE_HEIGHT)
         except:
             pass
 
-    # 2. Font Detection
-    has_custom_font = register_custom_fonts()
-    if has_custom_font:
-        main_font = FONT_NAME_REGULAR
-        name_font = FONT_NAME_REGULAR
-    else:
-        main_font = "Helvetica"
-        name_font = "Helvetica-Bold"
+    # 2. Fonts (resolved at import)
+    main_font = _MAIN_FONT
+    name_font = _NAME_FONT
 
     data = doc.candidate_data
 
@@ -201,7 +357,7 @@ def draw_first_page_bg(canvas, doc):
     # Try User Photo first
     if user_photo:
         try:
-            image_to_draw = ImageReader(user_photo)
+            image_to_draw = load_remote_image(user_photo)
         except Exception as e:
             print(f"Failed to load user photo ({user_photo}): {e}")
             image_to_draw = None
@@ -209,7 +365,7 @@ def draw_first_page_bg(canvas, doc):
     # Fallback to Default if user photo failed or wasn't provided
     if not image_to_draw and PHOTO_URL_DEFAULT:
         try:
-            image_to_draw = ImageReader(PHOTO_URL_DEFAULT)
+            image_to_draw = load_remote_image(PHOTO_URL_DEFAULT)
         except Exception as e:
             print(f"Failed to load default photo: {e}")
 
@@ -236,6 +392,111 @@ def draw_later_pages_bg(canvas, doc):
     canvas.restoreState()
 
 
+# --- PDF GENERATION ---
+
+_PAGE_TEMPLATES = threading.local()
+
+
+def get_page_templates():
+    """Returns this thread's First/Later page templates, building them on first use.
+
+    Frames keep a layout cursor while a document is built, so they are reused
+    per thread instead of being shared between concurrent requests.
+    """
+    templates = getattr(_PAGE_TEMPLATES, 'templates', None)
+    if templates is None:
+        frame_first = Frame(BOX_X, BOX_BOTTOM_Y, BOX_WIDTH, BOX_HEIGHT, id='F1', showBoundary=0)
+        frame_later = Frame(40, 50, PAGE_WIDTH - 80, PAGE_HEIGHT - 100, id='F2', showBoundary=0)
+        templates = [
+            PageTemplate(id='First', frames=[frame_first], onPage=draw_first_page_bg),
+            PageTemplate(id='Later', frames=[frame_later], onPage=draw_later_pages_bg)
+        ]
+        _PAGE_TEMPLATES.templates = templates
+    return templates
+
+
+def build_pdf(req_data, ai_text):
+    """Builds the report and returns the PDF bytes. Runs inside a pool worker."""
+    # 1. Setup PDF Buffer (In-Memory)
+    buffer = io.BytesIO()
+    doc = BaseDocTemplate(buffer, pagesize=A4, pageCompression=1)
+
+    # Pass request data to doc for callbacks
+    doc.candidate_data = req_data
+
+    # 2. Frames & Templates
+    doc.addPageTemplates(get_page_templates())
+
+    # 3. Build Story
+    story = []
+    story.append(NextPageTemplate('Later'))
+
+    # Parse AI Text
+    qa_data, remaining_text = parse_full_report(ai_text)
+
+    # Add Chart
+    if qa_data:
+        story.append(Paragraph("<b>Score Overview</b>", _HEADING_STYLE))
+        chart = create_score_chart(qa_data)
+        if chart:
+            story.append(chart)
+            story.append(Spacer(1, 15))
+
+    # Add Table
+    if qa_data:
+        story.append(Paragraph("<b>Detailed Question Analysis</b>", _HEADING_STYLE))
+        story.append(Spacer(1, 5))
+        table = create_qa_table(qa_data)
+        story.append(table)
+        story.append(Spacer(1, 20))
+
+    # Add Remaining Text
+    if remaining_text:
+        story.append(Paragraph(format_remaining_text(remaining_text), _BODY_STYLE))
+
+    # 4. Generate PDF
+    doc.build(story)
+    return buffer.getvalue()
+
+
+_PDF_POOL = None
+_PDF_POOL_LOCK = threading.Lock()
+
+
+def get_pdf_pool():
+    """Starts the PDF worker pool on first use; returns None where processes are unavailable."""
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None and PDF_WORKERS < 2:
+            # A single worker only adds pickling overhead on top of the in-process build
+            _PDF_POOL = False
+        elif _PDF_POOL is None:
+            try:
+                # Spawned workers import this module, which registers the font and loads the template
+                _PDF_POOL = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                                mp_context=multiprocessing.get_context('spawn'))
+            except (OSError, NotImplementedError) as e:
+                print(f"Warning: PDF worker pool unavailable, building in-process: {e}")
+                _PDF_POOL = False
+    return _PDF_POOL or None
+
+
+def render_pdf(req_data, ai_text):
+    """Runs build_pdf in a worker process so doc.build does not hold the request thread's GIL."""
+    global _PDF_POOL
+    pool = get_pdf_pool()
+    if pool is None:
+        return build_pdf(req_data, ai_text)
+    try:
+        return pool.submit(build_pdf, req_data, ai_text).result()
+    except BrokenProcessPool as e:
+        print(f"Warning: PDF worker pool broke, building in-process: {e}")
+        with _PDF_POOL_LOCK:
+            if _PDF_POOL is pool:
+                _PDF_POOL = None
+        return build_pdf(req_data, ai_text)
+
+
 # --- API ENDPOINT ---
 
 @app.route('/generate-report', methods=['POST'])
@@ -246,86 +507,41 @@ def generate_report_api():
         if not req_data:
             return jsonify({"error": "No JSON data provided"}), 400
 
+        if not isinstance(req_data, dict):
+            return jsonify({"error": "JSON body must be an object"}), 400
+
         # Required fields check
-        required_fields = ['candidate_name', 'candidate_position', 'date', 'interview_id', 'ai_overview']
-        for field in required_fields:
-            if field not in req_data:
-                return jsonify({"error": f"Missing field: {field}"}), 400
+        missing = _REQUIRED_FIELD_SET.difference(req_data)
+        if missing:
+            field = next(f for f in REQUIRED_FIELDS if f in missing)
+            return jsonify({"error": f"Missing field: {field}"}), 400
 
+        # Type checks before any PDF work is started
         ai_text = req_data['ai_overview']
+        if not isinstance(ai_text, str):
+            return jsonify({"error": "ai_overview must be a string"}), 400
 
-        # 2. Setup PDF Buffer (In-Memory)
-        buffer = io.BytesIO()
-        doc = BaseDocTemplate(buffer, pagesize=A4)
+        interview_id = req_data['interview_id']
+        id_text = str(interview_id)
+        if isinstance(interview_id, bool) or not isinstance(interview_id, (str, int)) \
+                or "\n" in id_text or "\r" in id_text:
+            return jsonify({"error": "interview_id must be a single-line string or integer"}), 400
 
-        # Pass request data to doc for callbacks
-        doc.candidate_data = req_data
+        # 2. Generate PDF
+        pdf_bytes = render_pdf(req_data, ai_text)
 
-        # 3. Frames & Templates
-        frame_first = Frame(BOX_X, BOX_BOTTOM_Y, BOX_WIDTH, BOX_HEIGHT, id='F1', showBoundary=0)
-        frame_later = Frame(40, 50, PAGE_WIDTH - 80, PAGE_HEIGHT - 100, id='F2', showBoundary=0)
-
-        doc.addPageTemplates([
-            PageTemplate(id='First', frames=[frame_first], onPage=draw_first_page_bg),
-            PageTemplate(id='Later', frames=[frame_later], onPage=draw_later_pages_bg)
-        ])
-
-        # 4. Build Story
-        styles = getSampleStyleSheet()
-        heading_style = ParagraphStyle('Head', parent=styles['Heading3'], fontSize=12,
-                                       textColor=colors.HexColor("#1F2A3C"), spaceAfter=6)
-        body_style = ParagraphStyle('Body', parent=styles['Normal'], fontSize=10, leading=14)
-
-        story = []
-        story.append(NextPageTemplate('Later'))
-
-        # Parse AI Text
-        qa_data, remaining_text = parse_full_report(ai_text)
-
-        # Add Chart
-        if qa_data:
-            story.append(Paragraph("<b>Score Overview</b>", heading_style))
-            chart = create_score_chart(qa_data)
-            if chart:
-                story.append(chart)
-                story.append(Spacer(1, 15))
-
-        # Add Table
-        if qa_data:
-            story.append(Paragraph("<b>Detailed Question Analysis</b>", heading_style))
-            story.append(Spacer(1, 5))
-            table = create_qa_table(qa_data)
-            story.append(table)
-            story.append(Spacer(1, 20))
-
-        # Add Remaining Text
-        if remaining_text:
-            fmt_text = remaining_text.replace("\n", "<br/>")
-            fmt_text = re.sub(r"(Overall Evaluation:)", r"<b>\1</b>", fmt_text)
-            fmt_text = re.sub(r"(Final Recommendation:)", r"<br/><br/><b>\1</b>", fmt_text)
-            fmt_text = re.sub(r"(Strengths:)", r"<b>\1</b>", fmt_text)
-            fmt_text = re.sub(r"(Weaknesses:)", r"<b>\1</b>", fmt_text)
-
-            story.append(Paragraph(fmt_text, body_style))
-
-        # 5. Generate PDF
-        doc.build(story)
-        buffer.seek(0)
-
-        # 6. Return File
-        filename = f"Report_{req_data['interview_id']}.pdf"
-        return send_file(
-            buffer,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/pdf'
-        )
+        # 3. Return File
+        filename = f"Report_{id_text}.pdf"
+        response = Response(pdf_bytes, mimetype='application/pdf')
+        response.headers.set('Content-Disposition', 'attachment', **attachment_filename_options(filename))
+        return response
 
     except Exception as e:
         print(f"Error generating PDF: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
+# Local development only; production runs wsgi:app under gunicorn (see wsgi.py)
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=False)
 
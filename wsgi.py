@@ -0,0 +1,12 @@
+"""WSGI entry point for production servers.
+
+    gunicorn -w $(nproc) -k gthread --threads 4 -b 0.0.0.0:5000 wsgi:app
+
+Each gunicorn worker is already its own process, so PDFs are built in-process
+by default here; set PDF_WORKERS to give each worker its own PDF pool.
+"""
+import os
+
+os.environ.setdefault("PDF_WORKERS", "1")
+
+from app import app